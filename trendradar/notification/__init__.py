@@ -25,6 +25,7 @@ from trendradar.notification.formatters import (
 from trendradar.notification.batch import (
     get_batch_header,
     get_max_batch_header_size,
+    utf8_len,
     truncate_to_bytes,
     add_batch_headers,
 )
@@ -58,6 +59,7 @@ __all__ = [
     # 批次处理
     "get_batch_header",
     "get_max_batch_header_size",
+    "utf8_len",
     "truncate_to_bytes",
     "add_batch_headers",
     # 内容渲染
@@ -6,11 +6,57 @@
 """
 
 from datetime import datetime
+from itertools import chain, islice
 from typing import Dict, Optional, Callable
 
 from trendradar.report.formatter import format_title_for_platform
 
 
+# 热点词汇标题模板，按 (count >= 5) + (count >= 10) 选档：普通 / 上升 / 火热
+_FEISHU_TIERS = (
+    "📌 {seq} **{word}** : {count} 条\n\n",
+    "📈 {seq} **{word}** : <font color='orange'>{count}</font> 条\n\n",
+    "🔥 {seq} **{word}** : <font color='red'>{count}</font> 条\n\n",
+)
+_DINGTALK_TIERS = (
+    "📌 {seq} **{word}** : {count} 条\n\n",
+    "📈 {seq} **{word}** : **{count}** 条\n\n",
+    "🔥 {seq} **{word}** : **{count}** 条\n\n",
+)
+
+# 新闻条目模板（热点循环内使用 % 格式化）
+_STATS_ITEM_TMPL = "  %d. %s\n"
+_NEW_ITEM_TMPL_INDENT = "  %d. %s\n"
+_NEW_ITEM_TMPL_FLAT = "%d. %s\n"
+
+# 平铺模式分组的来源标记（用对象身份判断，避免与真实来源名混淆）
+_FLAT_MARK = object()
+
+# 各平台渲染差异（预先构建好的格式字符串），飞书与钉钉共用同一渲染流程
+_PLATFORM_SPECS = {
+    "feishu": {
+        "platform": "feishu",
+        "header_fmt": None,
+        "sequence_fmt": "<font color='grey'>[{}/{}]</font>",
+        "word_tiers": _FEISHU_TIERS,
+        "source_header_fmt": "**{}** ({} 条):\n",
+        "failed_item_fmt": "  • <font color='red'>{}</font>",
+        "footer_fmt": "\n\n<font color='grey'>更新时间：{}</font>",
+        "update_fmt": "\n<font color='grey'>TrendRadar 发现新版本 {}，当前 {}</font>",
+    },
+    "dingtalk": {
+        "platform": "dingtalk",
+        "header_fmt": "**总新闻数：** {}\n\n**时间：** {}\n\n**类型：** 热点分析报告\n\n---\n\n",
+        "sequence_fmt": "[{}/{}]",
+        "word_tiers": _DINGTALK_TIERS,
+        "source_header_fmt": "**{}** ({} 条):\n\n",
+        "failed_item_fmt": "  • **{}**",
+        "footer_fmt": "\n\n> 更新时间：{}",
+        "update_fmt": "\n> TrendRadar 发现新版本 **{}**，当前 **{}**",
+    },
+}
+
+
 def render_feishu_content(
     report_data: Dict,
     update_info: Optional[Dict] = None,
@@ -36,180 +82,18 @@ def render_feishu_content(
     Returns:
         格式化的飞书消息内容
     """
-    # 限制新闻总数并处理显示模式
-    total_news_count = 0
-    truncated_stats = []
-    truncated_new_titles = []
-    original_total_new_count = report_data.get("total_new_count", 0)
-    
-    # 如果不显示统计分组，将 stats 中的新闻转换为完全平铺格式（不分平台）
-    if not show_stats_in_push and report_data["stats"]:
-        # 收集所有匹配的新闻到一个列表（完全平铺，不分组）
-        all_titles = []
-        for stat in report_data["stats"]:
-            for title_data in stat["titles"]:
-                all_titles.append(title_data)
-        
-        # 转换为平铺格式（单个分组，包含所有新闻）
-        flattened_titles = [{
-            "source_name": "匹配的新闻",  # 不显示平台，统一标题
-            "titles": all_titles
-        }]
-        
-        # 合并到 new_titles
-        if report_data["new_titles"]:
-            all_new_titles = flattened_titles + report_data["new_titles"]
-        else:
-            all_new_titles = flattened_titles
-        
-        # 更新总数
-        original_total_new_count = len(all_titles) + report_data.get("total_new_count", 0)
-    else:
-        all_new_titles = report_data["new_titles"]
-    
-    if max_total_news_in_push > 0:
-        # 统计并截断 stats 中的新闻
-        if show_stats_in_push and report_data["stats"]:
-            for stat in report_data["stats"]:
-                if total_news_count >= max_total_news_in_push:
-                    break
-                remaining = max_total_news_in_push - total_news_count
-                truncated_titles = stat["titles"][:remaining]
-                if truncated_titles:
-                    truncated_stats.append({
-                        "word": stat["word"],
-                        "count": len(truncated_titles),
-                        "titles": truncated_titles
-                    })
-                    total_news_count += len(truncated_titles)
-        
-        # 统计并截断 new_titles 中的新闻
-        if all_new_titles:
-            for source_data in all_new_titles:
-                if total_news_count >= max_total_news_in_push:
-                    break
-                remaining = max_total_news_in_push - total_news_count
-                truncated_titles = source_data["titles"][:remaining]
-                if truncated_titles:
-                    truncated_new_titles.append({
-                        "source_name": source_data["source_name"],
-                        "titles": truncated_titles
-                    })
-                    total_news_count += len(truncated_titles)
-    else:
-        # 不限制数量
-        truncated_stats = report_data["stats"] if show_stats_in_push else []
-        truncated_new_titles = all_new_titles
-
-    # 生成热点词汇统计部分
-    stats_content = ""
-    if show_stats_in_push and truncated_stats:
-        stats_content += "📊 **热点词汇统计**\n\n"
-
-        total_count = len(truncated_stats)
-
-        for i, stat in enumerate(truncated_stats):
-            word = stat["word"]
-            count = stat["count"]
-
-            sequence_display = f"<font color='grey'>[{i + 1}/{total_count}]</font>"
-
-            if count >= 10:
-                stats_content += f"🔥 {sequence_display} **{word}** : <font color='red'>{count}</font> 条\n\n"
-            elif count >= 5:
-                stats_content += f"📈 {sequence_display} **{word}** : <font color='orange'>{count}</font> 条\n\n"
-            else:
-                stats_content += f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-
-            for j, title_data in enumerate(stat["titles"], 1):
-                formatted_title = format_title_for_platform(
-                    "feishu", title_data, show_source=True
-                )
-                stats_content += f"  {j}. {formatted_title}\n"
-
-                if j < len(stat["titles"]):
-                    stats_content += "\n"
-
-            if i < len(truncated_stats) - 1:
-                stats_content += f"\n{separator}\n\n"
-
-    # 生成新增新闻部分
-    new_titles_content = ""
-    if truncated_new_titles:
-        # 统计所有新闻的总序号
-        total_index = 0
-        for source_data in truncated_new_titles:
-            # 如果是平铺模式（不分平台），不显示任何标题
-            if source_data['source_name'] != "匹配的新闻":
-                # 非平铺模式：显示平台分类标题
-                new_titles_content += (
-                    f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n"
-                )
-                indent = "  "
-            else:
-                # 平铺模式：不显示标题，直接显示新闻
-                indent = ""
-
-            for title_data in source_data["titles"]:
-                total_index += 1
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
-                formatted_title = format_title_for_platform(
-                    "feishu", title_data_copy, show_source=True  # 平铺模式显示来源
-                )
-                new_titles_content += f"{indent}{total_index}. {formatted_title}\n"
-
-            # 只在非平铺模式下添加换行
-            if source_data['source_name'] != "匹配的新闻":
-                new_titles_content += "\n"
-
-    # 根据配置决定内容顺序
-    text_content = ""
-    if reverse_content_order:
-        # 新增热点在前，热点词汇统计在后
-        if new_titles_content:
-            text_content += new_titles_content
-            if stats_content:
-                text_content += f"\n{separator}\n\n"
-        if stats_content:
-            text_content += stats_content
-    else:
-        # 默认：热点词汇统计在前，新增热点在后
-        if stats_content:
-            text_content += stats_content
-            if new_titles_content:
-                text_content += f"\n{separator}\n\n"
-        if new_titles_content:
-            text_content += new_titles_content
-
-    if not text_content:
-        if mode == "incremental":
-            mode_text = "增量模式下暂无新增匹配的热点词汇"
-        elif mode == "current":
-            mode_text = "当前榜单模式下暂无匹配的热点词汇"
-        else:
-            mode_text = "暂无匹配的热点词汇"
-        text_content = f"📭 {mode_text}\n\n"
-
-    if report_data["failed_ids"]:
-        if text_content and "暂无匹配" not in text_content:
-            text_content += f"\n{separator}\n\n"
-
-        text_content += "⚠️ **数据获取失败的平台：**\n\n"
-        for i, id_value in enumerate(report_data["failed_ids"], 1):
-            text_content += f"  • <font color='red'>{id_value}</font>\n"
-
-    # 获取当前时间
-    now = get_time_func() if get_time_func else datetime.now()
-    text_content += (
-        f"\n\n<font color='grey'>更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}</font>"
+    return _render_notification(
+        _PLATFORM_SPECS["feishu"],
+        report_data,
+        update_info=update_info,
+        mode=mode,
+        separator=separator,
+        reverse_content_order=reverse_content_order,
+        max_total_news_in_push=max_total_news_in_push,
+        show_stats_in_push=show_stats_in_push,
+        get_time_func=get_time_func,
     )
 
-    if update_info:
-        text_content += f"\n<font color='grey'>TrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}</font>"
-
-    return text_content
-
 
 def render_dingtalk_content(
     report_data: Dict,
@@ -234,38 +118,65 @@ def render_dingtalk_content(
     Returns:
         格式化的钉钉消息内容
     """
+    return _render_notification(
+        _PLATFORM_SPECS["dingtalk"],
+        report_data,
+        update_info=update_info,
+        mode=mode,
+        separator="---",
+        reverse_content_order=reverse_content_order,
+        max_total_news_in_push=max_total_news_in_push,
+        show_stats_in_push=show_stats_in_push,
+        get_time_func=get_time_func,
+    )
+
+
+def _render_notification(
+    spec: Dict,
+    report_data: Dict,
+    update_info: Optional[Dict],
+    mode: str,
+    separator: str,
+    reverse_content_order: bool,
+    max_total_news_in_push: int,
+    show_stats_in_push: bool,
+    get_time_func: Optional[Callable[[], datetime]],
+) -> str:
+    """飞书/钉钉共用的渲染流程，平台差异由 spec 提供"""
     # 限制新闻总数并处理显示模式
     total_news_count = 0
     truncated_stats = []
     truncated_new_titles = []
-    original_total_new_count = report_data.get("total_new_count", 0)
-    
+    news_budget = max_total_news_in_push if max_total_news_in_push > 0 else None
+
     # 如果不显示统计分组，将 stats 中的新闻转换为完全平铺格式（不分平台）
     if not show_stats_in_push and report_data["stats"]:
-        # 收集所有匹配的新闻到一个列表（完全平铺，不分组）
-        all_titles = []
-        for stat in report_data["stats"]:
-            for title_data in stat["titles"]:
-                all_titles.append(title_data)
-        
-        # 转换为平铺格式（单个分组，包含所有新闻）
-        flattened_titles = [{
-            "source_name": "匹配的新闻",  # 不显示平台，统一标题
-            "titles": all_titles
-        }]
-        
-        # 合并到 new_titles
-        if report_data["new_titles"]:
-            all_new_titles = flattened_titles + report_data["new_titles"]
-        else:
-            all_new_titles = flattened_titles
-        
-        # 更新总数
-        original_total_new_count = len(all_titles) + report_data.get("total_new_count", 0)
-    else:
-        all_new_titles = report_data["new_titles"]
-    
+        # 收集匹配的新闻到一个列表（完全平铺，不分组），收集时直接按上限截断
+        flat_titles = list(
+            islice(
+                chain.from_iterable(stat["titles"] for stat in report_data["stats"]),
+                news_budget,
+            )
+        )
+
+        # 平铺格式（单个分组，包含所有新闻）排在 new_titles 之前
+        truncated_new_titles.append({
+            "source_name": _FLAT_MARK,  # 不显示平台，统一标题
+            "titles": flat_titles
+        })
+        total_news_count = len(flat_titles)
+
+    # 新闻总数未超过上限时无需逐组切片
+    needs_truncation = False
     if max_total_news_in_push > 0:
+        total_available = total_news_count + sum(
+            len(source_data["titles"]) for source_data in report_data["new_titles"]
+        )
+        if show_stats_in_push:
+            total_available += sum(len(stat["titles"]) for stat in report_data["stats"])
+        needs_truncation = total_available > max_total_news_in_push
+
+    if needs_truncation:
         # 统计并截断 stats 中的新闻
         if show_stats_in_push and report_data["stats"]:
             for stat in report_data["stats"]:
@@ -280,135 +191,165 @@ def render_dingtalk_content(
                         "titles": truncated_titles
                     })
                     total_news_count += len(truncated_titles)
-        
+
         # 统计并截断 new_titles 中的新闻
-        if all_new_titles:
-            for source_data in all_new_titles:
-                if total_news_count >= max_total_news_in_push:
-                    break
-                remaining = max_total_news_in_push - total_news_count
-                truncated_titles = source_data["titles"][:remaining]
-                if truncated_titles:
-                    truncated_new_titles.append({
-                        "source_name": source_data["source_name"],
-                        "titles": truncated_titles
-                    })
-                    total_news_count += len(truncated_titles)
+        for source_data in report_data["new_titles"]:
+            if total_news_count >= max_total_news_in_push:
+                break
+            remaining = max_total_news_in_push - total_news_count
+            truncated_titles = source_data["titles"][:remaining]
+            if truncated_titles:
+                truncated_new_titles.append({
+                    "source_name": source_data["source_name"],
+                    "titles": truncated_titles
+                })
+                total_news_count += len(truncated_titles)
+    elif max_total_news_in_push > 0:
+        # 未超出上限：与截断结果保持一致（跳过空分组，条数取实际展示数），
+        # 条数与标题数一致的分组直接引用原字典
+        if show_stats_in_push:
+            truncated_stats = [
+                stat
+                if stat["count"] == len(stat["titles"])
+                else {"word": stat["word"], "count": len(stat["titles"]), "titles": stat["titles"]}
+                for stat in report_data["stats"]
+                if stat["titles"]
+            ]
+        truncated_new_titles.extend(
+            source_data for source_data in report_data["new_titles"] if source_data["titles"]
+        )
     else:
         # 不限制数量
         truncated_stats = report_data["stats"] if show_stats_in_push else []
-        truncated_new_titles = all_new_titles
+        truncated_new_titles.extend(report_data["new_titles"])
 
-    total_titles = sum(
-        len(stat["titles"]) for stat in truncated_stats if stat["count"] > 0
-    )
+    # 获取当前时间
     now = get_time_func() if get_time_func else datetime.now()
+    now_str = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # 头部信息
-    header_content = f"**总新闻数：** {total_titles}\n\n"
-    header_content += f"**时间：** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    header_content += "**类型：** 热点分析报告\n\n"
-    header_content += "---\n\n"
+    # 循环内复用的局部变量
+    platform = spec["platform"]
+    fmt = format_title_for_platform
+    sep_block = f"\n{separator}\n\n"
+    sequence_fmt = spec["sequence_fmt"]
+    word_tiers = spec["word_tiers"]
 
     # 生成热点词汇统计部分
-    stats_content = ""
+    stats_parts = []
     if show_stats_in_push and truncated_stats:
-        stats_content += "📊 **热点词汇统计**\n\n"
+        stats_parts.append("📊 **热点词汇统计**\n\n")
 
         total_count = len(truncated_stats)
 
         for i, stat in enumerate(truncated_stats):
+            # 分隔符写在词组之前（首个词组除外），无需与末尾下标比较
+            if i:
+                stats_parts.append(sep_block)
+
             word = stat["word"]
             count = stat["count"]
 
-            sequence_display = f"[{i + 1}/{total_count}]"
-
-            if count >= 10:
-                stats_content += f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-            elif count >= 5:
-                stats_content += f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-            else:
-                stats_content += f"📌 {sequence_display} **{word}** : {count} 条\n\n"
+            sequence_display = sequence_fmt.format(i + 1, total_count)
 
-            for j, title_data in enumerate(stat["titles"], 1):
-                formatted_title = format_title_for_platform(
-                    "dingtalk", title_data, show_source=True
+            stats_parts.append(
+                word_tiers[(count >= 5) + (count >= 10)].format(
+                    seq=sequence_display, word=word, count=count
                 )
-                stats_content += f"  {j}. {formatted_title}\n"
+            )
 
-                if j < len(stat["titles"]):
-                    stats_content += "\n"
-
-            if i < len(truncated_stats) - 1:
-                stats_content += "\n---\n\n"
+            for k, title_data in enumerate(stat["titles"]):
+                if k:
+                    stats_parts.append("\n")
+                formatted_title = fmt(platform, title_data, show_source=True)
+                stats_parts.append(_STATS_ITEM_TMPL % (k + 1, formatted_title))
 
     # 生成新增新闻部分
-    new_titles_content = ""
+    new_titles_parts = []
     if truncated_new_titles:
+        source_header_fmt = spec["source_header_fmt"]
         # 统计所有新闻的总序号
         total_index = 0
         for source_data in truncated_new_titles:
             # 如果是平铺模式（不分平台），不显示任何标题
-            if source_data['source_name'] != "匹配的新闻":
+            is_flat = source_data["source_name"] is _FLAT_MARK
+            if not is_flat:
                 # 非平铺模式：显示平台分类标题
-                new_titles_content += f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-                indent = "  "
+                new_titles_parts.append(
+                    source_header_fmt.format(
+                        source_data["source_name"], len(source_data["titles"])
+                    )
+                )
+                item_tmpl = _NEW_ITEM_TMPL_INDENT
             else:
                 # 平铺模式：不显示标题，直接显示新闻
-                indent = ""
+                item_tmpl = _NEW_ITEM_TMPL_FLAT
 
             for title_data in source_data["titles"]:
                 total_index += 1
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
-                formatted_title = format_title_for_platform(
-                    "dingtalk", title_data_copy, show_source=True  # 平铺模式显示来源
+                formatted_title = fmt(
+                    platform,
+                    title_data,
+                    show_source=True,  # 平铺模式显示来源
+                    is_new_override=False,
                 )
-                new_titles_content += f"{indent}{total_index}. {formatted_title}\n"
+                new_titles_parts.append(item_tmpl % (total_index, formatted_title))
 
             # 只在非平铺模式下添加换行
-            if source_data['source_name'] != "匹配的新闻":
-                new_titles_content += "\n"
+            if not is_flat:
+                new_titles_parts.append("\n")
+
+    # 根据配置决定内容顺序（先收集片段，最后一次性拼接）
+    text_parts = []
+    if spec["header_fmt"]:
+        total_titles = sum(
+            len(stat["titles"]) for stat in truncated_stats if stat["count"] > 0
+        )
+        text_parts.append(spec["header_fmt"].format(total_titles, now_str))
 
-    # 根据配置决定内容顺序
-    text_content = header_content
     if reverse_content_order:
         # 新增热点在前，热点词汇统计在后
-        if new_titles_content:
-            text_content += new_titles_content
-            if stats_content:
-                text_content += "\n---\n\n"
-        if stats_content:
-            text_content += stats_content
+        if new_titles_parts:
+            text_parts.extend(new_titles_parts)
+            if stats_parts:
+                text_parts.append(sep_block)
+        if stats_parts:
+            text_parts.extend(stats_parts)
     else:
         # 默认：热点词汇统计在前，新增热点在后
-        if stats_content:
-            text_content += stats_content
-            if new_titles_content:
-                text_content += "\n---\n\n"
-        if new_titles_content:
-            text_content += new_titles_content
-
-    if not stats_content and not new_titles_content:
+        if stats_parts:
+            text_parts.extend(stats_parts)
+            if new_titles_parts:
+                text_parts.append(sep_block)
+        if new_titles_parts:
+            text_parts.extend(new_titles_parts)
+
+    is_empty_fallback = not stats_parts and not new_titles_parts
+    if is_empty_fallback:
         if mode == "incremental":
             mode_text = "增量模式下暂无新增匹配的热点词汇"
         elif mode == "current":
             mode_text = "当前榜单模式下暂无匹配的热点词汇"
         else:
             mode_text = "暂无匹配的热点词汇"
-        text_content += f"📭 {mode_text}\n\n"
+        text_parts.append(f"📭 {mode_text}\n\n")
 
     if report_data["failed_ids"]:
-        if "暂无匹配" not in text_content:
-            text_content += "\n---\n\n"
+        if not is_empty_fallback:
+            text_parts.append(sep_block)
 
-        text_content += "⚠️ **数据获取失败的平台：**\n\n"
-        for i, id_value in enumerate(report_data["failed_ids"], 1):
-            text_content += f"  • **{id_value}**\n"
+        text_parts.append("⚠️ **数据获取失败的平台：**\n\n")
+        text_parts.append(
+            "\n".join(map(spec["failed_item_fmt"].format, report_data["failed_ids"]))
+        )
+        text_parts.append("\n")
 
-    text_content += f"\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
+    text_parts.append(spec["footer_fmt"].format(now_str))
 
     if update_info:
-        text_content += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
+        text_parts.append(
+            spec["update_fmt"].format(
+                update_info["remote_version"], update_info["current_version"]
+            )
+        )
 
-    return text_content
+    return "".join(text_parts)
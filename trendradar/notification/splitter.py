@@ -5,9 +5,13 @@
 提供消息内容分批拆分功能，确保消息大小不超过各平台限制
 """
 
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Dict, List, Optional, Callable
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Callable, Tuple
 
+from trendradar.notification.batch import utf8_len
 from trendradar.report.formatter import format_title_for_platform
 
 
@@ -20,6 +24,217 @@ DEFAULT_BATCH_SIZES = {
 }
 
 
+@dataclass(frozen=True)
+class FormatProfile:
+    """推送格式模板集合（每次分批只解析一次 format_type，循环内直接套用模板）"""
+
+    word_hi_tmpl: str = ""          # 词组标题（count >= 10），占位符 {seq} {word} {count}
+    word_mid_tmpl: str = ""         # 词组标题（count >= 5）
+    word_lo_tmpl: str = ""          # 词组标题（其他）
+    separator_tmpl: str = ""        # 词组间分隔符，占位符 {sep}（飞书分隔符）
+    new_header_tmpl: str = ""       # 新增新闻标题，占位符 {sep} {total} {hint}
+    source_header_tmpl: str = ""    # 新增新闻来源标题，占位符 {name} {count}
+    failed_header_tmpl: str = ""    # 失败平台标题，占位符 {sep}（飞书分隔符）
+    failed_line_tmpl: str = "  • {id}\n"  # 失败平台条目，占位符 {id}
+
+
+_MARKDOWN_PROFILE = FormatProfile(
+    word_hi_tmpl="🔥 {seq} **{word}** : **{count}** 条\n\n",
+    word_mid_tmpl="📈 {seq} **{word}** : **{count}** 条\n\n",
+    word_lo_tmpl="📌 {seq} **{word}** : {count} 条\n\n",
+    separator_tmpl="\n\n",
+    new_header_tmpl="\n\n🆕 **本次新增热点新闻** (共 {total} 条{hint})\n\n",
+    source_header_tmpl="**{name}** ({count} 条):\n\n",
+    failed_header_tmpl="\n\n⚠️ **数据获取失败的平台：**\n\n",
+)
+
+_WEWORK_PROFILE = FormatProfile(
+    word_hi_tmpl=_MARKDOWN_PROFILE.word_hi_tmpl,
+    word_mid_tmpl=_MARKDOWN_PROFILE.word_mid_tmpl,
+    word_lo_tmpl=_MARKDOWN_PROFILE.word_lo_tmpl,
+    separator_tmpl="\n\n\n\n",
+    new_header_tmpl="\n\n\n\n🆕 **本次新增热点新闻** (共 {total} 条{hint})\n\n",
+    source_header_tmpl=_MARKDOWN_PROFILE.source_header_tmpl,
+    failed_header_tmpl="\n\n\n\n⚠️ **数据获取失败的平台：**\n\n",
+)
+
+# 各推送格式的模板（未列出的格式使用空模板）
+_FORMAT_PROFILES = {
+    "wework": _WEWORK_PROFILE,
+    "bark": replace(_WEWORK_PROFILE, failed_header_tmpl=""),
+    "ntfy": _MARKDOWN_PROFILE,
+    "telegram": FormatProfile(
+        word_hi_tmpl="🔥 {seq} {word} : {count} 条\n\n",
+        word_mid_tmpl="📈 {seq} {word} : {count} 条\n\n",
+        word_lo_tmpl="📌 {seq} {word} : {count} 条\n\n",
+        separator_tmpl="\n\n",
+        new_header_tmpl="\n\n🆕 本次新增热点新闻 (共 {total} 条{hint})\n\n",
+        source_header_tmpl="{name} ({count} 条):\n\n",
+        failed_header_tmpl="\n\n⚠️ 数据获取失败的平台：\n\n",
+    ),
+    "feishu": FormatProfile(
+        word_hi_tmpl="🔥 <font color='grey'>{seq}</font> **{word}** : <font color='red'>{count}</font> 条\n\n",
+        word_mid_tmpl="📈 <font color='grey'>{seq}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n",
+        word_lo_tmpl="📌 <font color='grey'>{seq}</font> **{word}** : {count} 条\n\n",
+        separator_tmpl="\n{sep}\n\n",
+        new_header_tmpl="\n{sep}\n\n🆕 **本次新增热点新闻** (共 {total} 条{hint})\n\n",
+        source_header_tmpl=_MARKDOWN_PROFILE.source_header_tmpl,
+        failed_header_tmpl="\n{sep}\n\n⚠️ **数据获取失败的平台：**\n\n",
+        failed_line_tmpl="  • <font color='red'>{id}</font>\n",
+    ),
+    "dingtalk": FormatProfile(
+        word_hi_tmpl=_MARKDOWN_PROFILE.word_hi_tmpl,
+        word_mid_tmpl=_MARKDOWN_PROFILE.word_mid_tmpl,
+        word_lo_tmpl=_MARKDOWN_PROFILE.word_lo_tmpl,
+        separator_tmpl="\n---\n\n",
+        new_header_tmpl="\n---\n\n🆕 **本次新增热点新闻** (共 {total} 条{hint})\n\n",
+        source_header_tmpl=_MARKDOWN_PROFILE.source_header_tmpl,
+        failed_header_tmpl="\n---\n\n⚠️ **数据获取失败的平台：**\n\n",
+        failed_line_tmpl="  • **{id}**\n",
+    ),
+    "slack": FormatProfile(
+        word_hi_tmpl="🔥 {seq} *{word}* : *{count}* 条\n\n",
+        word_mid_tmpl="📈 {seq} *{word}* : *{count}* 条\n\n",
+        word_lo_tmpl="📌 {seq} *{word}* : {count} 条\n\n",
+        separator_tmpl="\n\n",
+        new_header_tmpl="\n\n🆕 *本次新增热点新闻* (共 {total} 条{hint})\n\n",
+        source_header_tmpl="*{name}* ({count} 条):\n\n",
+    ),
+}
+_EMPTY_PROFILE = FormatProfile()
+
+# 推送格式 -> format_title_for_platform 使用的平台标识（未列出的格式直接使用原始标题）
+_PLATFORM_MAP = {
+    "wework": "wework",
+    "bark": "wework",
+    "telegram": "telegram",
+    "ntfy": "ntfy",
+    "feishu": "feishu",
+    "dingtalk": "dingtalk",
+    "slack": "slack",
+}
+
+_get_titles = itemgetter("titles")
+
+
+@dataclass(frozen=True)
+class _PackConfig:
+    """单次分批中固定不变的参数（批次头尾、容量、模板等）"""
+
+    format_type: str
+    profile: FormatProfile
+    feishu_separator: str
+    base_header: str
+    base_header_bytes: int
+    base_footer: str
+    batch_capacity: int             # 单批可用字节数（max_bytes 减去页脚）
+    stats_header: str
+    stats_header_bytes: int
+    total_new_count: int            # 原始报告中的新增新闻总数
+    max_total_news_in_push: int
+
+
+@dataclass
+class _PackState:
+    """分批打包过程中的可变状态（parts 始终原地修改，便于预先绑定 append）"""
+
+    parts: List[str]
+    cur_bytes: int                  # 当前批次的精确 UTF-8 字节数，后续所有分批判断都依赖它，不能用字符数估算代替
+    has_content: bool
+    batches: List[str]
+
+
+def _template_fixed_bytes(template: str, *fields: str) -> int:
+    """计算模板去掉占位符后固定部分的 UTF-8 字节数
+
+    模板中每个占位符只出现一次，填充后的字节数 = 固定部分字节数 + 各字段值的字节数。
+    """
+    for field in fields:
+        template = template.replace("{" + field + "}", "")
+    return utf8_len(template)
+
+
+@lru_cache(maxsize=64)
+def _build_scaffold(
+    format_type: str,
+    total_titles: int,
+    time_str: str,
+    update_key: Optional[Tuple[str, str]],
+) -> Tuple[str, str, str]:
+    """生成批次的固定片段（批次头部、页脚、统计标题）
+
+    同一渠道配置多个账号时，同一份报告会在同一秒内按相同参数逐个账号分批，
+    结果按参数缓存；时间只需在调用方格式化一次。
+
+    Args:
+        format_type: 格式类型
+        total_titles: 总新闻数
+        time_str: 已格式化的更新时间
+        update_key: (远程版本, 当前版本)，无版本更新时为 None
+
+    Returns:
+        (base_header, base_footer, stats_header)
+    """
+    base_header = ""
+    if format_type in ("wework", "bark"):
+        base_header = f"**总新闻数：** {total_titles}\n\n\n\n"
+    elif format_type == "telegram":
+        base_header = f"总新闻数： {total_titles}\n\n"
+    elif format_type == "ntfy":
+        base_header = f"**总新闻数：** {total_titles}\n\n"
+    elif format_type == "feishu":
+        base_header = ""
+    elif format_type == "dingtalk":
+        base_header = f"**总新闻数：** {total_titles}\n\n"
+        base_header += f"**时间：** {time_str}\n\n"
+        base_header += f"**类型：** 热点分析报告\n\n"
+        base_header += "---\n\n"
+    elif format_type == "slack":
+        base_header = f"*总新闻数：* {total_titles}\n\n"
+
+    base_footer = ""
+    if format_type in ("wework", "bark"):
+        base_footer = f"\n\n\n> 更新时间：{time_str}"
+        if update_key:
+            base_footer += f"\n> TrendRadar 发现新版本 **{update_key[0]}**，当前 **{update_key[1]}**"
+    elif format_type == "telegram":
+        base_footer = f"\n\n更新时间：{time_str}"
+        if update_key:
+            base_footer += f"\nTrendRadar 发现新版本 {update_key[0]}，当前 {update_key[1]}"
+    elif format_type == "ntfy":
+        base_footer = f"\n\n> 更新时间：{time_str}"
+        if update_key:
+            base_footer += f"\n> TrendRadar 发现新版本 **{update_key[0]}**，当前 **{update_key[1]}**"
+    elif format_type == "feishu":
+        base_footer = f"\n\n<font color='grey'>更新时间：{time_str}</font>"
+        if update_key:
+            base_footer += f"\n<font color='grey'>TrendRadar 发现新版本 {update_key[0]}，当前 {update_key[1]}</font>"
+    elif format_type == "dingtalk":
+        base_footer = f"\n\n> 更新时间：{time_str}"
+        if update_key:
+            base_footer += f"\n> TrendRadar 发现新版本 **{update_key[0]}**，当前 **{update_key[1]}**"
+    elif format_type == "slack":
+        base_footer = f"\n\n_更新时间：{time_str}_"
+        if update_key:
+            base_footer += f"\n_TrendRadar 发现新版本 *{update_key[0]}*，当前 *{update_key[1]}_"
+
+    stats_header = ""
+    if format_type in ("wework", "bark"):
+        stats_header = f"📊 **热点词汇统计**\n\n"
+    elif format_type == "telegram":
+        stats_header = f"📊 热点词汇统计\n\n"
+    elif format_type == "ntfy":
+        stats_header = f"📊 **热点词汇统计**\n\n"
+    elif format_type == "feishu":
+        stats_header = f"📊 **热点词汇统计**\n\n"
+    elif format_type == "dingtalk":
+        stats_header = f"📊 **热点词汇统计**\n\n"
+    elif format_type == "slack":
+        stats_header = f"📊 *热点词汇统计*\n\n"
+
+    return base_header, base_footer, stats_header
+
+
 def split_content_into_batches(
     report_data: Dict,
     format_type: str,
@@ -64,143 +279,110 @@ def split_content_into_batches(
         else:
             max_bytes = sizes.get("default", 4000)
 
-    # 限制新闻总数并处理显示模式
-    truncated_report_data = report_data.copy()
-    
+    profile = _FORMAT_PROFILES.get(format_type, _EMPTY_PROFILE)
+
+    # 限制新闻总数并处理显示模式（只读引用输入数据，仅在需要改动时构建新的外层字典）
+    truncated_report_data = report_data
+
     # 如果不显示统计分组，将 stats 中的新闻转换为完全平铺格式（不分平台）
     if not show_stats_in_push and report_data["stats"]:
         # 收集所有匹配的新闻到一个列表（完全平铺，不分组）
-        all_titles = []
-        for stat in report_data["stats"]:
-            for title_data in stat["titles"]:
-                all_titles.append(title_data)
-        
+        all_titles = [
+            title_data for stat in report_data["stats"] for title_data in stat["titles"]
+        ]
+
         # 转换为 new_titles 格式（单个分组，包含所有新闻）
         flattened_titles = [{
             "source_name": "匹配的新闻",  # 不显示平台，统一标题
             "titles": all_titles
         }]
-        
-        # 清空 stats，将新闻移到 new_titles 中
-        truncated_report_data["stats"] = []
-        # 合并原有的 new_titles
-        if truncated_report_data["new_titles"]:
-            truncated_report_data["new_titles"] = flattened_titles + truncated_report_data["new_titles"]
-        else:
-            truncated_report_data["new_titles"] = flattened_titles
-        # 更新总数
-        truncated_report_data["total_new_count"] = len(all_titles) + report_data.get("total_new_count", 0)
-    
+
+        # 清空 stats，将新闻移到 new_titles 中（合并原有的 new_titles）并更新总数
+        truncated_report_data = {
+            **report_data,
+            "stats": [],
+            "new_titles": flattened_titles + report_data["new_titles"],
+            "total_new_count": len(all_titles) + report_data.get("total_new_count", 0),
+        }
+
     # 限制新闻总数
     if max_total_news_in_push > 0:
-        total_news_count = 0
+        remaining = max_total_news_in_push
         truncated_stats = []
         truncated_new_titles = []
-        
-        # 统计并截断 stats 中的新闻
-        if truncated_report_data["stats"]:
-            for stat in truncated_report_data["stats"]:
-                if total_news_count >= max_total_news_in_push:
-                    break
-                remaining = max_total_news_in_push - total_news_count
-                truncated_titles = stat["titles"][:remaining]
-                if truncated_titles:
-                    truncated_stats.append({
-                        "word": stat["word"],
-                        "count": len(truncated_titles),
-                        "titles": truncated_titles
-                    })
-                    total_news_count += len(truncated_titles)
-        
+
+        # 统计并截断 stats 中的新闻（无需截断的分组直接引用原字典）
+        for stat in truncated_report_data["stats"]:
+            if remaining <= 0:
+                break
+            titles = stat["titles"]
+            if not titles:
+                continue
+            if len(titles) <= remaining and stat["count"] == len(titles):
+                truncated_stats.append(stat)
+            else:
+                titles = titles[:remaining]
+                truncated_stats.append({
+                    "word": stat["word"],
+                    "count": len(titles),
+                    "titles": titles
+                })
+            remaining -= len(titles)
+
         # 统计并截断 new_titles 中的新闻
-        if truncated_report_data["new_titles"]:
-            for source_data in truncated_report_data["new_titles"]:
-                if total_news_count >= max_total_news_in_push:
-                    break
-                remaining = max_total_news_in_push - total_news_count
-                truncated_titles = source_data["titles"][:remaining]
-                if truncated_titles:
-                    truncated_new_titles.append({
-                        "source_name": source_data["source_name"],
-                        "titles": truncated_titles
-                    })
-                    total_news_count += len(truncated_titles)
-        
+        for source_data in truncated_report_data["new_titles"]:
+            if remaining <= 0:
+                break
+            titles = source_data["titles"]
+            if not titles:
+                continue
+            if len(titles) <= remaining:
+                truncated_new_titles.append(source_data)
+            else:
+                titles = titles[:remaining]
+                truncated_new_titles.append({
+                    "source_name": source_data["source_name"],
+                    "titles": titles
+                })
+            remaining -= len(titles)
+
+        # 仍引用输入数据时才复制外层字典，平铺阶段已新建的字典直接原地修改
+        if truncated_report_data is report_data:
+            truncated_report_data = dict(report_data)
         truncated_report_data["stats"] = truncated_stats
         truncated_report_data["new_titles"] = truncated_new_titles
 
     batches = []
 
     # 计算总新闻数（包括 stats 和 new_titles）
-    total_titles = sum(
-        len(stat["titles"]) for stat in truncated_report_data["stats"] if stat["count"] > 0
-    )
+    # count 为 0 的词组没有匹配到任何标题（titles 为空），无需额外过滤
+    total_titles = sum(map(len, map(_get_titles, truncated_report_data["stats"])))
     # 如果 stats 为空但有 new_titles，统计 new_titles 的数量
     if total_titles == 0 and truncated_report_data["new_titles"]:
         total_titles = sum(
-            len(source["titles"]) for source in truncated_report_data["new_titles"]
+            map(len, map(_get_titles, truncated_report_data["new_titles"]))
         )
     now = get_time_func() if get_time_func else datetime.now()
-
-    base_header = ""
-    if format_type in ("wework", "bark"):
-        base_header = f"**总新闻数：** {total_titles}\n\n\n\n"
-    elif format_type == "telegram":
-        base_header = f"总新闻数： {total_titles}\n\n"
-    elif format_type == "ntfy":
-        base_header = f"**总新闻数：** {total_titles}\n\n"
-    elif format_type == "feishu":
-        base_header = ""
-    elif format_type == "dingtalk":
-        base_header = f"**总新闻数：** {total_titles}\n\n"
-        base_header += f"**时间：** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        base_header += f"**类型：** 热点分析报告\n\n"
-        base_header += "---\n\n"
-    elif format_type == "slack":
-        base_header = f"*总新闻数：* {total_titles}\n\n"
-
-    base_footer = ""
-    if format_type in ("wework", "bark"):
-        base_footer = f"\n\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-    elif format_type == "telegram":
-        base_footer = f"\n\n更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\nTrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}"
-    elif format_type == "ntfy":
-        base_footer = f"\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-    elif format_type == "feishu":
-        base_footer = f"\n\n<font color='grey'>更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}</font>"
-        if update_info:
-            base_footer += f"\n<font color='grey'>TrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}</font>"
-    elif format_type == "dingtalk":
-        base_footer = f"\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-    elif format_type == "slack":
-        base_footer = f"\n\n_更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}_"
-        if update_info:
-            base_footer += f"\n_TrendRadar 发现新版本 *{update_info['remote_version']}*，当前 *{update_info['current_version']}_"
-
-    stats_header = ""
-    if truncated_report_data["stats"]:
-        if format_type in ("wework", "bark"):
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "telegram":
-            stats_header = f"📊 热点词汇统计\n\n"
-        elif format_type == "ntfy":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "feishu":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "dingtalk":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "slack":
-            stats_header = f"📊 *热点词汇统计*\n\n"
-
-    current_batch = base_header
+    update_key = (
+        (update_info["remote_version"], update_info["current_version"])
+        if update_info
+        else None
+    )
+    base_header, base_footer, stats_header = _build_scaffold(
+        format_type, total_titles, now.strftime("%Y-%m-%d %H:%M:%S"), update_key
+    )
+    if not truncated_report_data["stats"]:
+        stats_header = ""
+
+    # 预先计算固定片段的 UTF-8 字节数，批次大小用累加计数维护，避免反复编码整个批次
+    base_header_bytes = utf8_len(base_header)
+    footer_bytes = utf8_len(base_footer)
+    stats_header_bytes = utf8_len(stats_header)
+    # 单个批次中除页脚外可用的字节容量：片段可追加当且仅当 已用字节 + 片段字节 < 容量
+    batch_capacity = max_bytes - footer_bytes
+
+    current_batch_parts = [base_header]
+    current_batch_bytes = base_header_bytes
     current_batch_has_content = False
 
     if (
@@ -214,464 +396,417 @@ def split_content_into_batches(
             mode_text = "当前榜单模式下暂无匹配的热点词汇"
         else:
             mode_text = "暂无匹配的热点词汇"
-        simple_content = f"📭 {mode_text}\n\n"
-        final_content = base_header + simple_content + base_footer
-        batches.append(final_content)
+        batches.append(f"{base_header}📭 {mode_text}\n\n{base_footer}")
         return batches
 
-    # 定义处理热点词汇统计的函数
-    def process_stats_section(current_batch, current_batch_has_content, batches):
-        """处理热点词汇统计"""
-        if not truncated_report_data["stats"]:
-            return current_batch, current_batch_has_content, batches
-
-        total_count = len(truncated_report_data["stats"])
-
-        # 添加统计标题
-        test_content = current_batch + stats_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            < max_bytes
-        ):
-            current_batch = test_content
-            current_batch_has_content = True
-        else:
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + stats_header
-            current_batch_has_content = True
-
-        # 逐个处理词组（确保词组标题+第一条新闻的原子性）
-        for i, stat in enumerate(truncated_report_data["stats"]):
-            word = stat["word"]
-            count = stat["count"]
-            sequence_display = f"[{i + 1}/{total_count}]"
-
-            # 构建词组标题
-            word_header = ""
-            if format_type in ("wework", "bark"):
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "telegram":
-                if count >= 10:
-                    word_header = f"🔥 {sequence_display} {word} : {count} 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 {sequence_display} {word} : {count} 条\n\n"
-                else:
-                    word_header = f"📌 {sequence_display} {word} : {count} 条\n\n"
-            elif format_type == "ntfy":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "feishu":
-                if count >= 10:
-                    word_header = f"🔥 <font color='grey'>{sequence_display}</font> **{word}** : <font color='red'>{count}</font> 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 <font color='grey'>{sequence_display}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n"
-                else:
-                    word_header = f"📌 <font color='grey'>{sequence_display}</font> **{word}** : {count} 条\n\n"
-            elif format_type == "dingtalk":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "slack":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} *{word}* : *{count}* 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} *{word}* : *{count}* 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} *{word}* : {count} 条\n\n"
-
-            # 构建第一条新闻
-            first_news_line = ""
-            if stat["titles"]:
-                first_title_data = stat["titles"][0]
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", first_title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", first_title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", first_title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", first_title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", first_title_data, show_source=True
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", first_title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{first_title_data['title']}"
-
-                first_news_line = f"  1. {formatted_title}\n"
-                if len(stat["titles"]) > 1:
-                    first_news_line += "\n"
-
-            # 原子性检查：词组标题+第一条新闻必须一起处理
-            word_with_first_news = word_header + first_news_line
-            test_content = current_batch + word_with_first_news
-
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                # 当前批次容纳不下，开启新批次
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + stats_header + word_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-                start_index = 1
-
-            # 处理剩余新闻条目
-            for j in range(start_index, len(stat["titles"])):
-                title_data = stat["titles"][j]
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data, show_source=True
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{title_data['title']}"
-
-                news_line = f"  {j + 1}. {formatted_title}\n"
-                if j < len(stat["titles"]) - 1:
-                    news_line += "\n"
-
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + stats_header + word_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
-
-            # 词组间分隔符
-            if i < len(truncated_report_data["stats"]) - 1:
-                separator = ""
-                if format_type in ("wework", "bark"):
-                    separator = f"\n\n\n\n"
-                elif format_type == "telegram":
-                    separator = f"\n\n"
-                elif format_type == "ntfy":
-                    separator = f"\n\n"
-                elif format_type == "feishu":
-                    separator = f"\n{feishu_separator}\n\n"
-                elif format_type == "dingtalk":
-                    separator = f"\n---\n\n"
-                elif format_type == "slack":
-                    separator = f"\n\n"
-
-                test_content = current_batch + separator
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    < max_bytes
-                ):
-                    current_batch = test_content
-
-        return current_batch, current_batch_has_content, batches
-
-    # 定义处理新增新闻的函数
-    def process_new_titles_section(current_batch, current_batch_has_content, batches):
-        """处理新增新闻"""
-        if not truncated_report_data["new_titles"]:
-            return current_batch, current_batch_has_content, batches
-
-        # 判断是否为平铺模式（不显示分类标题）
-        is_flat_mode = any(s["source_name"] == "匹配的新闻" for s in truncated_report_data["new_titles"])
-        
-        new_header = ""
-        # 平铺模式不显示"本次新增热点新闻"标题
-        if not is_flat_mode:
-            # 计算实际显示的新闻总数
-            actual_new_count = sum(len(s["titles"]) for s in truncated_report_data["new_titles"])
-            truncated_hint = f" (已截取前 {actual_new_count} 条)" if max_total_news_in_push > 0 and actual_new_count < report_data['total_new_count'] else ""
-
-            if format_type in ("wework", "bark"):
-                new_header = f"\n\n\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-            elif format_type == "telegram":
-                new_header = (
-                    f"\n\n🆕 本次新增热点新闻 (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-                )
-            elif format_type == "ntfy":
-                new_header = f"\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-            elif format_type == "feishu":
-                new_header = f"\n{feishu_separator}\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-            elif format_type == "dingtalk":
-                new_header = f"\n---\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-            elif format_type == "slack":
-                new_header = f"\n\n🆕 *本次新增热点新闻* (共 {report_data['total_new_count']} 条{truncated_hint})\n\n"
-
-        # 只有在非平铺模式下才添加 new_header
-        if new_header:
-            test_content = current_batch + new_header
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + new_header
-                current_batch_has_content = True
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-
-        # 逐个处理新增新闻来源
-        for source_data in truncated_report_data["new_titles"]:
-            # 判断是否为平铺模式（不分平台）
-            is_flat_mode = source_data['source_name'] == "匹配的新闻"
-            
-            source_header = ""
-            # 平铺模式不显示平台分类标题
-            if not is_flat_mode:
-                if format_type in ("wework", "bark"):
-                    source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-                elif format_type == "telegram":
-                    source_header = f"{source_data['source_name']} ({len(source_data['titles'])} 条):\n\n"
-                elif format_type == "ntfy":
-                    source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-                elif format_type == "feishu":
-                    source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-                elif format_type == "dingtalk":
-                    source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-                elif format_type == "slack":
-                    source_header = f"*{source_data['source_name']}* ({len(source_data['titles'])} 条):\n\n"
-
-            # 构建第一条新增新闻
-            first_news_line = ""
-            if source_data["titles"]:
-                first_title_data = source_data["titles"][0]
-                title_data_copy = first_title_data.copy()
-                title_data_copy["is_new"] = False
-
-                # 平铺模式显示来源
-                show_source = is_flat_mode
-
-                if format_type in ("wework", "bark"):
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data_copy, show_source=show_source
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
-
-                first_news_line = f"1. {formatted_title}\n" if is_flat_mode else f"  1. {formatted_title}\n"
-
-            # 原子性检查：来源标题+第一条新闻
-            source_with_first_news = source_header + first_news_line
-            test_content = current_batch + source_with_first_news
-
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + new_header + source_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-                start_index = 1
-
-            # 处理剩余新增新闻
-            for j in range(start_index, len(source_data["titles"])):
-                title_data = source_data["titles"][j]
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
-
-                # 平铺模式显示来源
-                show_source = is_flat_mode
-
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=show_source
-                    )
-                elif format_type == "slack":
-                    formatted_title = format_title_for_platform(
-                        "slack", title_data_copy, show_source=show_source
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
-
-                news_line = f"{j + 1}. {formatted_title}\n" if is_flat_mode else f"  {j + 1}. {formatted_title}\n"
-
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + new_header + source_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
-
-            current_batch += "\n"
-
-        return current_batch, current_batch_has_content, batches
+    cfg = _PackConfig(
+        format_type=format_type,
+        profile=profile,
+        feishu_separator=feishu_separator,
+        base_header=base_header,
+        base_header_bytes=base_header_bytes,
+        base_footer=base_footer,
+        batch_capacity=batch_capacity,
+        stats_header=stats_header,
+        stats_header_bytes=stats_header_bytes,
+        total_new_count=report_data["total_new_count"],
+        max_total_news_in_push=max_total_news_in_push,
+    )
+    state = _PackState(
+        parts=current_batch_parts,
+        cur_bytes=current_batch_bytes,
+        has_content=current_batch_has_content,
+        batches=batches,
+    )
 
     # 根据配置决定处理顺序
     if reverse_content_order:
         # 新增热点在前，热点词汇统计在后
-        current_batch, current_batch_has_content, batches = process_new_titles_section(
-            current_batch, current_batch_has_content, batches
-        )
-        current_batch, current_batch_has_content, batches = process_stats_section(
-            current_batch, current_batch_has_content, batches
-        )
+        section_order = (_pack_new_titles_section, _pack_stats_section)
     else:
         # 默认：热点词汇统计在前，新增热点在后
-        current_batch, current_batch_has_content, batches = process_stats_section(
-            current_batch, current_batch_has_content, batches
+        section_order = (_pack_stats_section, _pack_new_titles_section)
+
+    for pack_section in section_order:
+        pack_section(state, cfg, truncated_report_data)
+
+    _pack_failed_section(state, cfg, truncated_report_data)
+
+    # 完成最后批次
+    if state.has_content:
+        state.parts.append(base_footer)
+        batches.append("".join(state.parts))
+
+    return batches
+
+
+def _pack_stats_section(state: _PackState, cfg: _PackConfig, report: Dict) -> None:
+    """处理热点词汇统计"""
+    stats = report["stats"]
+    if not stats:
+        return
+
+    platform = _PLATFORM_MAP.get(cfg.format_type)
+    profile = cfg.profile
+    base_header = cfg.base_header
+    base_header_bytes = cfg.base_header_bytes
+    base_footer = cfg.base_footer
+    batch_capacity = cfg.batch_capacity
+    # 循环中频繁调用的函数绑定为局部变量（LOAD_FAST 代替全局查找）
+    _utf8_len = utf8_len
+    _len = len
+    stats_header = cfg.stats_header
+    stats_header_bytes = cfg.stats_header_bytes
+
+    total_count = _len(stats)
+    # 当前格式的三档词组标题模板（按 count 依次对应 <5、>=5、>=10）及模板固定部分的字节数
+    word_tiers = tuple(
+        (tpl, _template_fixed_bytes(tpl, "seq", "word", "count"))
+        for tpl in (profile.word_lo_tmpl, profile.word_mid_tmpl, profile.word_hi_tmpl)
+    )
+    separator = profile.separator_tmpl.format(sep=cfg.feishu_separator)
+    separator_bytes = _utf8_len(separator)
+
+    # 预处理：一次性生成每个词组的 (文本, 字节数) 行列表 [词组标题, 第1条, 第2条, ...]，
+    # 打包循环只需比较整数并追加字符串
+    stat_lines = []
+    for i, stat in enumerate(stats):
+        word = str(stat["word"])
+        count = stat["count"]
+        sequence_display = f"[{i + 1}/{total_count}]"
+
+        # 构建词组标题
+        tpl, tpl_bytes = word_tiers[(count >= 5) + (count >= 10)]
+        word_header = tpl.format_map(
+            {"seq": sequence_display, "word": word, "count": count}
         )
-        current_batch, current_batch_has_content, batches = process_new_titles_section(
-            current_batch, current_batch_has_content, batches
+        # 序号和数量均为 ASCII，只有词组名需要按 UTF-8 计量
+        word_header_bytes = (
+            tpl_bytes + _utf8_len(word) + _len(sequence_display) + _len(str(count))
+            if tpl
+            else 0
         )
-
-    if report_data["failed_ids"]:
-        failed_header = ""
-        if format_type == "wework":
-            failed_header = f"\n\n\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "telegram":
-            failed_header = f"\n\n⚠️ 数据获取失败的平台：\n\n"
-        elif format_type == "ntfy":
-            failed_header = f"\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "feishu":
-            failed_header = f"\n{feishu_separator}\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "dingtalk":
-            failed_header = f"\n---\n\n⚠️ **数据获取失败的平台：**\n\n"
-
-        test_content = current_batch + failed_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            >= max_bytes
-        ):
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + failed_header
-            current_batch_has_content = True
-        else:
-            current_batch = test_content
-            current_batch_has_content = True
-
-        for i, id_value in enumerate(report_data["failed_ids"], 1):
-            if format_type == "feishu":
-                failed_line = f"  • <font color='red'>{id_value}</font>\n"
-            elif format_type == "dingtalk":
-                failed_line = f"  • **{id_value}**\n"
+        lines = [(word_header, word_header_bytes)]
+
+        # 构建新闻条目
+        last_index = _len(stat["titles"]) - 1
+        for j, title_data in enumerate(stat["titles"]):
+            if platform:
+                formatted_title = format_title_for_platform(
+                    platform, title_data, show_source=True
+                )
             else:
-                failed_line = f"  • {id_value}\n"
-
-            test_content = current_batch + failed_line
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + failed_header + failed_line
-                current_batch_has_content = True
+                formatted_title = f"{title_data['title']}"
+            title_bytes = _utf8_len(formatted_title)
+
+            # 同一词组内的新闻之间空一行
+            news_line = (
+                f"  {j + 1}. {formatted_title}\n\n"
+                if j < last_index
+                else f"  {j + 1}. {formatted_title}\n"
+            )
+            # 序号、缩进和换行均为 ASCII（字符数即字节数），只有标题本身需要按 UTF-8 计量
+            lines.append(
+                (news_line, title_bytes + _len(news_line) - _len(formatted_title))
+            )
+
+        stat_lines.append((lines, sum(line_bytes for _, line_bytes in lines)))
+
+    # 打包循环内的状态读写都走局部变量，结束时再写回 state
+    parts = state.parts
+    parts_append = parts.append
+    parts_extend = parts.extend
+    batches_append = state.batches.append
+    cur_bytes = state.cur_bytes
+    has_content = state.has_content
+
+    # 添加统计标题
+    if cur_bytes + stats_header_bytes < batch_capacity:
+        parts_append(stats_header)
+        cur_bytes += stats_header_bytes
+        has_content = True
+    else:
+        if has_content:
+            parts_append(base_footer)
+            batches_append("".join(parts))
+        parts[:] = [base_header, stats_header]
+        cur_bytes = base_header_bytes + stats_header_bytes
+        has_content = True
+
+    # 逐个处理词组（确保词组标题+第一条新闻的原子性）
+    for i, (lines, group_bytes) in enumerate(stat_lines):
+        if cur_bytes + group_bytes < batch_capacity:
+            # 整个词组都能放入当前批次，逐行检查必然不会溢出，直接整体追加
+            parts_extend(text for text, _ in lines)
+            cur_bytes += group_bytes
+            has_content = True
+            if i < total_count - 1:
+                if cur_bytes + separator_bytes < batch_capacity:
+                    parts_append(separator)
+                    cur_bytes += separator_bytes
+            continue
+
+        word_header, word_header_bytes = lines[0]
+        first_news_line, first_news_bytes = lines[1] if _len(lines) > 1 else ("", 0)
+
+        # 原子性检查：词组标题+第一条新闻必须一起处理
+        word_with_first_news = word_header + first_news_line
+        word_with_first_news_bytes = word_header_bytes + first_news_bytes
+
+        if cur_bytes + word_with_first_news_bytes >= batch_capacity:
+            # 当前批次容纳不下，开启新批次
+            if has_content:
+                parts_append(base_footer)
+                batches_append("".join(parts))
+            parts[:] = [base_header, stats_header, word_with_first_news]
+            cur_bytes = (
+                base_header_bytes + stats_header_bytes + word_with_first_news_bytes
+            )
+            has_content = True
+        else:
+            parts_append(word_with_first_news)
+            cur_bytes += word_with_first_news_bytes
+            has_content = True
+
+        # 处理剩余新闻条目
+        for news_line, news_line_bytes in lines[2:]:
+            if cur_bytes + news_line_bytes >= batch_capacity:
+                if has_content:
+                    parts_append(base_footer)
+                    batches_append("".join(parts))
+                parts[:] = [base_header, stats_header, word_header, news_line]
+                cur_bytes = (
+                    base_header_bytes
+                    + stats_header_bytes
+                    + word_header_bytes
+                    + news_line_bytes
+                )
+                has_content = True
             else:
-                current_batch = test_content
-                current_batch_has_content = True
+                parts_append(news_line)
+                cur_bytes += news_line_bytes
+                has_content = True
+
+        # 词组间分隔符
+        if i < total_count - 1:
+            if cur_bytes + separator_bytes < batch_capacity:
+                parts_append(separator)
+                cur_bytes += separator_bytes
+
+    state.cur_bytes = cur_bytes
+    state.has_content = has_content
+
+
+def _pack_new_titles_section(
+    state: _PackState, cfg: _PackConfig, report: Dict
+) -> None:
+    """处理新增新闻"""
+    new_titles = report["new_titles"]
+    if not new_titles:
+        return
+
+    platform = _PLATFORM_MAP.get(cfg.format_type)
+    profile = cfg.profile
+    base_header = cfg.base_header
+    base_header_bytes = cfg.base_header_bytes
+    base_footer = cfg.base_footer
+    batch_capacity = cfg.batch_capacity
+    _utf8_len = utf8_len
+    _len = len
+
+    # 判断是否为平铺模式（不显示分类标题）
+    is_flat_mode = any(s["source_name"] == "匹配的新闻" for s in new_titles)
+
+    new_header = ""
+    # 平铺模式不显示"本次新增热点新闻"标题
+    if not is_flat_mode:
+        # 计算实际显示的新闻总数
+        actual_new_count = sum(_len(s["titles"]) for s in new_titles)
+        truncated_hint = f" (已截取前 {actual_new_count} 条)" if cfg.max_total_news_in_push > 0 and actual_new_count < cfg.total_new_count else ""
+
+        new_header = profile.new_header_tmpl.format(
+            sep=cfg.feishu_separator,
+            total=cfg.total_new_count,
+            hint=truncated_hint,
+        )
 
-    # 完成最后批次
-    if current_batch_has_content:
-        batches.append(current_batch + base_footer)
+    new_header_bytes = _utf8_len(new_header)
 
-    return batches
+    source_tmpl = profile.source_header_tmpl
+    source_tmpl_bytes = _template_fixed_bytes(source_tmpl, "name", "count")
+
+    # 预处理：一次性生成每个来源的 (文本, 字节数) 行列表 [来源标题, 第1条, 第2条, ...]
+    source_lines = []
+    for source_data in new_titles:
+        # 判断是否为平铺模式（不分平台）
+        is_flat_mode = source_data['source_name'] == "匹配的新闻"
+
+        source_header = ""
+        source_header_bytes = 0
+        # 平铺模式不显示平台分类标题
+        if not is_flat_mode:
+            source_name = str(source_data["source_name"])
+            title_count = _len(source_data["titles"])
+            source_header = source_tmpl.format(name=source_name, count=title_count)
+            if source_tmpl:
+                source_header_bytes = (
+                    source_tmpl_bytes + _utf8_len(source_name) + _len(str(title_count))
+                )
+        lines = [(source_header, source_header_bytes)]
+
+        # 平铺模式显示来源
+        show_source = is_flat_mode
+
+        for j, title_data in enumerate(source_data["titles"]):
+            if platform:
+                formatted_title = format_title_for_platform(
+                    platform,
+                    title_data,
+                    show_source=show_source,
+                    is_new_override=False,
+                )
+            else:
+                formatted_title = f"{title_data['title']}"
+            title_bytes = _utf8_len(formatted_title)
+
+            news_line = f"{j + 1}. {formatted_title}\n" if is_flat_mode else f"  {j + 1}. {formatted_title}\n"
+            lines.append(
+                (news_line, title_bytes + _len(news_line) - _len(formatted_title))
+            )
+
+        source_lines.append((lines, sum(line_bytes for _, line_bytes in lines)))
+
+    parts = state.parts
+    parts_append = parts.append
+    parts_extend = parts.extend
+    batches_append = state.batches.append
+    cur_bytes = state.cur_bytes
+    has_content = state.has_content
+
+    # 只有在非平铺模式下才添加 new_header
+    if new_header:
+        if cur_bytes + new_header_bytes >= batch_capacity:
+            if has_content:
+                parts_append(base_footer)
+                batches_append("".join(parts))
+            parts[:] = [base_header, new_header]
+            cur_bytes = base_header_bytes + new_header_bytes
+            has_content = True
+        else:
+            parts_append(new_header)
+            cur_bytes += new_header_bytes
+            has_content = True
+
+    # 逐个处理新增新闻来源
+    for lines, group_bytes in source_lines:
+        if cur_bytes + group_bytes < batch_capacity:
+            # 整个来源都能放入当前批次，直接整体追加
+            parts_extend(text for text, _ in lines)
+            cur_bytes += group_bytes
+            has_content = True
+            parts_append("\n")
+            cur_bytes += 1
+            continue
+
+        source_header, source_header_bytes = lines[0]
+        first_news_line, first_news_bytes = lines[1] if _len(lines) > 1 else ("", 0)
+
+        # 原子性检查：来源标题+第一条新闻
+        source_with_first_news = source_header + first_news_line
+        source_with_first_news_bytes = source_header_bytes + first_news_bytes
+
+        if cur_bytes + source_with_first_news_bytes >= batch_capacity:
+            if has_content:
+                parts_append(base_footer)
+                batches_append("".join(parts))
+            parts[:] = [base_header, new_header, source_with_first_news]
+            cur_bytes = (
+                base_header_bytes + new_header_bytes + source_with_first_news_bytes
+            )
+            has_content = True
+        else:
+            parts_append(source_with_first_news)
+            cur_bytes += source_with_first_news_bytes
+            has_content = True
+
+        # 处理剩余新增新闻
+        for news_line, news_line_bytes in lines[2:]:
+            if cur_bytes + news_line_bytes >= batch_capacity:
+                if has_content:
+                    parts_append(base_footer)
+                    batches_append("".join(parts))
+                parts[:] = [base_header, new_header, source_header, news_line]
+                cur_bytes = (
+                    base_header_bytes
+                    + new_header_bytes
+                    + source_header_bytes
+                    + news_line_bytes
+                )
+                has_content = True
+            else:
+                parts_append(news_line)
+                cur_bytes += news_line_bytes
+                has_content = True
+
+        parts_append("\n")
+        cur_bytes += 1
+
+    state.cur_bytes = cur_bytes
+    state.has_content = has_content
+
+
+def _pack_failed_section(state: _PackState, cfg: _PackConfig, report: Dict) -> None:
+    """处理数据获取失败的平台"""
+    failed_ids = report["failed_ids"]
+    if not failed_ids:
+        return
+
+    profile = cfg.profile
+    base_header = cfg.base_header
+    base_header_bytes = cfg.base_header_bytes
+    base_footer = cfg.base_footer
+    batch_capacity = cfg.batch_capacity
+    _utf8_len = utf8_len
+
+    failed_header = profile.failed_header_tmpl.format(sep=cfg.feishu_separator)
+    # 条目模板的固定部分只计量一次，每条只需计量失败平台 ID 本身（通常为 ASCII）
+    failed_line_tmpl = profile.failed_line_tmpl
+    failed_line_fixed_bytes = _utf8_len(failed_line_tmpl.replace("{id}", ""))
+
+    parts = state.parts
+    parts_append = parts.append
+    batches_append = state.batches.append
+    cur_bytes = state.cur_bytes
+    has_content = state.has_content
+
+    failed_header_bytes = _utf8_len(failed_header)
+    if cur_bytes + failed_header_bytes >= batch_capacity:
+        if has_content:
+            parts_append(base_footer)
+            batches_append("".join(parts))
+        parts[:] = [base_header, failed_header]
+        cur_bytes = base_header_bytes + failed_header_bytes
+        has_content = True
+    else:
+        parts_append(failed_header)
+        cur_bytes += failed_header_bytes
+        has_content = True
+
+    for id_value in failed_ids:
+        id_text = str(id_value)
+        failed_line = failed_line_tmpl.format(id=id_text)
+        failed_line_bytes = failed_line_fixed_bytes + _utf8_len(id_text)
+        if cur_bytes + failed_line_bytes >= batch_capacity:
+            if has_content:
+                parts_append(base_footer)
+                batches_append("".join(parts))
+            parts[:] = [base_header, failed_header, failed_line]
+            cur_bytes = base_header_bytes + failed_header_bytes + failed_line_bytes
+            has_content = True
+        else:
+            parts_append(failed_line)
+            cur_bytes += failed_line_bytes
+            has_content = True
+
+    state.cur_bytes = cur_bytes
+    state.has_content = has_content
@@ -5,13 +5,16 @@
 提供多平台标题格式化功能
 """
 
-from typing import Dict
+from typing import Dict, Optional
 
 from trendradar.report.helpers import clean_title, html_escape, format_rank_display
 
 
 def format_title_for_platform(
-    platform: str, title_data: Dict, show_source: bool = True
+    platform: str,
+    title_data: Dict,
+    show_source: bool = True,
+    is_new_override: Optional[bool] = None,
 ) -> str:
     """统一的标题格式化方法
 
@@ -38,6 +41,8 @@ def format_title_for_platform(
             - mobile_url: 移动端链接（优先使用）
             - is_new: 是否为新增标题（可选）
         show_source: 是否显示来源名称
+        is_new_override: 覆盖 title_data 中的 is_new 标记（可选，None 表示不覆盖），
+            调用方无需为修改该标记而复制 title_data
 
     Returns:
         格式化后的标题字符串
@@ -48,6 +53,9 @@ def format_title_for_platform(
 
     link_url = title_data["mobile_url"] or title_data["url"]
     cleaned_title = clean_title(title_data["title"])
+    is_new = (
+        title_data.get("is_new") if is_new_override is None else is_new_override
+    )
 
     if platform == "feishu":
         if link_url:
@@ -55,7 +63,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"<font color='grey'>[{title_data['source_name']}]</font> {title_prefix}{formatted_title}"
@@ -77,7 +85,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"[{title_data['source_name']}] {title_prefix}{formatted_title}"
@@ -100,7 +108,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"[{title_data['source_name']}] {title_prefix}{formatted_title}"
@@ -122,7 +130,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"[{title_data['source_name']}] {title_prefix}{formatted_title}"
@@ -144,7 +152,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"[{title_data['source_name']}] {title_prefix}{formatted_title}"
@@ -168,7 +176,7 @@ def format_title_for_platform(
         else:
             formatted_title = cleaned_title
 
-        title_prefix = "🆕 " if title_data.get("is_new") else ""
+        title_prefix = "🆕 " if is_new else ""
 
         if show_source:
             result = f"[{title_data['source_name']}] {title_prefix}{formatted_title}"
@@ -214,7 +222,7 @@ def format_title_for_platform(
         if title_data["count"] > 1:
             formatted_title += f" <font color='green'>({title_data['count']}次)</font>"
 
-        if title_data.get("is_new"):
+        if is_new:
             formatted_title = f"<div class='new-title'>🆕 {formatted_title}</div>"
 
         return formatted_title